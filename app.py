@@ -1,8 +1,10 @@
 from flask import Flask
 from src.api.routes import api_blueprint
+from src.api.cache import cache
 from flask_swagger_ui import get_swaggerui_blueprint
 
 app = Flask(__name__)
+cache.init_app(app)
 app.register_blueprint(api_blueprint)
 
 # Swagger setup
@@ -0,0 +1,28 @@
+import multiprocessing
+import os
+
+from psycogreen.gevent import patch_psycopg
+
+# Gunicorn settings for serving the Weather API with gevent workers
+bind = "0.0.0.0:8000"
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = "gevent"
+worker_connections = 1000
+
+# Every worker opens its own database pool; split the connection budget between them so that
+# workers x (DB_POOL_SIZE + DB_MAX_OVERFLOW) stays within DB_MAX_CONNECTIONS. The workers
+# inherit these variables when src.config.database_config creates their engine
+db_max_connections = int(os.environ.get("DB_MAX_CONNECTIONS", 80))
+os.environ.setdefault("DB_POOL_SIZE", str(max(1, db_max_connections // workers)))
+os.environ.setdefault("DB_MAX_OVERFLOW", "0")
+
+
+def post_fork(server, worker):
+    """
+    Make psycopg2 yield to other greenlets while waiting on the database.
+
+    Args:
+        server (gunicorn.arbiter.Arbiter): Gunicorn master process.
+        worker (gunicorn.workers.base.Worker): Newly forked worker process.
+    """
+    patch_psycopg()
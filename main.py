@@ -6,6 +6,7 @@ from src.components.data_analysis import DataAnalysis, DataAnalysisConfig
 from src.components.data_ingestion import DataIngestionConfig,DataIngestion
 from src.components.data_modelling import DataModellingConfig,DataModelling
 from src.config.database_config import SQLALCHEMY_DATABASE_URI
+from src.api.cache import clear_cache
 
 def main():
     try:
@@ -42,6 +43,9 @@ def main():
         logging.info("Storing the Calculated Data Analysis Results into the Model")
         data_analyser.store_yearly_stats(yearly_stats)
 
+        logging.info("Clearing cached API responses")
+        clear_cache()
+
         logging.info("Data Analysis processes completed.")
         
        
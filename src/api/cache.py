@@ -0,0 +1,31 @@
+from flask import Flask
+from flask_caching import Cache
+from src.config.cache_config import CACHE_CONFIG, SHARED_CACHE_TYPES
+from src.logger import logging
+
+# Response cache used by the API routes
+cache = Cache(config=CACHE_CONFIG)
+
+def clear_cache():
+    """
+    Clear the cached API responses from outside the web application.
+
+    Called by the pipeline once new statistics are stored. Only a shared backend such as
+    RedisCache holds the entries of the API workers; for per-process backends the stale
+    entries simply expire after CACHE_DEFAULT_TIMEOUT. Failures are logged rather than
+    raised, since the statistics are already stored by the time this runs.
+    """
+    cache_type = CACHE_CONFIG['CACHE_TYPE']
+    if cache_type not in SHARED_CACHE_TYPES:
+        logging.warning(f"CACHE_TYPE '{cache_type}' is not shared with the API workers; "
+                        f"cached responses expire after {CACHE_CONFIG['CACHE_DEFAULT_TIMEOUT']} seconds")
+        return
+
+    try:
+        app = Flask(__name__)
+        cache.init_app(app)
+        with app.app_context():
+            cache.clear()
+        logging.info("Cached API responses cleared")
+    except Exception as e:
+        logging.error(f"Error clearing cached API responses: {e}")
@@ -1,20 +1,52 @@
 from flask import Blueprint, request, jsonify
 from src.services.weather_service import get_weather_data, get_weather_stats
+from src.api.cache import cache
 from src.logger import logging
 from src.exception import CustomException
 import sys
 
 api_blueprint = Blueprint('api', __name__)
 
+def parse_bool(value):
+    """
+    Parse a boolean query string parameter such as 'true' or '1'.
+
+    Args:
+        value (str): Raw query string value.
+
+    Returns:
+        bool: True for 'true', '1' or 'yes' in any case, False otherwise.
+    """
+    return value.lower() in ('true', '1', 'yes')
+
+def is_incomplete_cursor(*values):
+    """
+    Check whether only part of a pagination cursor was supplied.
+
+    Args:
+        *values: Cursor query string values, None when missing or invalid.
+
+    Returns:
+        bool: True if some but not all of the values are present.
+    """
+    present = [value is not None and value != '' for value in values]
+    return any(present) and not all(present)
+
 @api_blueprint.route('/api/weather', methods=['GET'])
 def weather():
     try:
         station_id = request.args.get('station_id')
         date = request.args.get('date')
-        page = request.args.get('page', 1, type=int)
+        after_station_id = request.args.get('after_station_id')
+        after_date = request.args.get('after_date')
         per_page = request.args.get('per_page', 10, type=int)
+        include_total = request.args.get('include_total', False, type=parse_bool)
 
-        data = get_weather_data(station_id, date, page, per_page)
+        # A partial cursor would silently restart from the first page
+        if is_incomplete_cursor(after_station_id, after_date):
+            return jsonify({'error': "'after_station_id' and 'after_date' must be given together"}), 400
+
+        data = get_weather_data(station_id, date, after_station_id, after_date, per_page, include_total)
         return jsonify(data)
     
     except Exception as e:
@@ -23,13 +55,20 @@ def weather():
         
 
 @api_blueprint.route('/api/weather/stats', methods=['GET'])
+@cache.cached(query_string=True)
 def weather_stats():
     try:
         station_id = request.args.get('station_id')
-        page = request.args.get('page', 1, type=int)
+        after_station_id = request.args.get('after_station_id')
+        after_year = request.args.get('after_year', type=int)
         per_page = request.args.get('per_page', 10, type=int)
+        include_total = request.args.get('include_total', False, type=parse_bool)
+
+        # A partial cursor would silently restart from the first page
+        if is_incomplete_cursor(after_station_id, after_year):
+            return jsonify({'error': "'after_station_id' and an integer 'after_year' must be given together"}), 400
 
-        data = get_weather_stats(station_id, page, per_page)
+        data = get_weather_stats(station_id, after_station_id, after_year, per_page, include_total)
 
         return jsonify(data)
     except Exception as e:
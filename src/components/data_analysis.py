@@ -1,10 +1,10 @@
 from dataclasses import dataclass
-from sqlalchemy import Column, Integer, String, Float, UniqueConstraint, func, case, MetaData
+from sqlalchemy import Column, Integer, String, Float, UniqueConstraint, func, select
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy import create_engine
-from src.components.data_modelling import WeatherData
-from src.config.database_config import SQLALCHEMY_DATABASE_URI
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from src.components.data_modelling import WeatherData, WEATHER_DATA_YEAR
+from src.config.database_config import SQLALCHEMY_DATABASE_URI, get_engine
 from src.logger import logging
 from src.exception import CustomException
 import sys
@@ -54,6 +54,14 @@ class WeatherStationYearlyStats(Base):
         }
 
 
+# Columns of 'weather_station_yearly_stats' filled from the yearly statistics query
+STATS_COLUMNS = ['station_id', 'year', 'avg_max_temp', 'avg_min_temp', 'total_precipitation']
+
+# Rows fetched per round-trip when streaming statistics, and rows buffered per bulk insert
+STREAM_BATCH_SIZE = 1000
+STORE_BATCH_SIZE = 10000
+
+
 @dataclass
 class DataAnalysisConfig:
     """
@@ -77,9 +85,8 @@ class DataAnalysis:
     Class for handling data analysis operations.
 
     Attributes:
-        engine (create_engine): SQLAlchemy engine instance.
+        engine (create_engine): Shared, pooled SQLAlchemy engine instance.
         Session (sessionmaker): SQLAlchemy sessionmaker instance.
-        metadata (MetaData): SQLAlchemy MetaData instance.
     """
     def __init__(self, analysis_config: DataAnalysisConfig):
         """
@@ -89,36 +96,24 @@ class DataAnalysis:
             analysis_config (DataAnalysisConfig): Configuration object containing analysis settings.
         """
         try:
-            self.engine = create_engine(analysis_config.database_uri)
-            self.Session = sessionmaker(bind=self.engine)
-            self.metadata = MetaData(bind=self.engine)
-            self.metadata.reflect()
+            self.engine = get_engine(analysis_config.database_uri)
+            # The store paths only append rows, so skip autoflush and the post-commit refresh
+            self.Session = sessionmaker(bind=self.engine, autoflush=False, expire_on_commit=False)
         except Exception as e:
             logging.error(f"Error initializing DataAnalysis: {e}")
             raise CustomException(e, sys)
 
     def create_weather_station_yearly_stats_table(self):
         """
-        Create or update the 'weather_station_yearly_stats' table in the database.
+        Create the 'weather_station_yearly_stats' table in the database if it does not exist.
 
-        Checks if the table exists and compares its schema with the defined ORM model.
-        If not exists or schema differs, creates or updates the table accordingly.
+        An existing table is left untouched; schema changes belong in a migration rather than
+        a drop and recreate that would discard the stored statistics.
         """
         try:
-            if 'weather_station_yearly_stats' not in self.metadata.tables:
-                logging.info("Creating 'weather_station_yearly_stats' table...")
-                Base.metadata.create_all(self.engine, tables=[WeatherStationYearlyStats.__table__])
-                logging.info("'weather_station_yearly_stats' table created.")
-            else:
-                # Compare schema and reflect changes if any
-                current_table = self.metadata.tables['weather_station_yearly_stats']
-                if not current_table.compare(WeatherStationYearlyStats.__table__):
-                    logging.info("Updating 'weather_station_yearly_stats' table schema...")
-                    current_table.drop(self.engine)
-                    Base.metadata.create_all(self.engine, tables=[WeatherStationYearlyStats.__table__])
-                    logging.info("'weather_station_yearly_stats' table schema updated.")
-                else:
-                    logging.info("'weather_station_yearly_stats' table already exists and schema matches.")
+            logging.info("Creating 'weather_station_yearly_stats' table if it does not exist...")
+            WeatherStationYearlyStats.__table__.create(self.engine, checkfirst=True)
+            logging.info("'weather_station_yearly_stats' table is ready.")
 
         except Exception as e:
             logging.error(f"Error creating 'weather_station_yearly_stats' table: {e}")
@@ -126,76 +121,121 @@ class DataAnalysis:
 
     def calculate_yearly_stats(self):
         """
-        Calculate yearly statistics for weather stations based on weather data.
+        Build the query calculating yearly statistics for weather stations based on weather data.
+
+        The query is returned unexecuted so that store_yearly_stats can run it server-side
+        as part of an INSERT ... SELECT.
 
         Returns:
-            list: List of tuples containing yearly statistics for each station.
+            Select: Query yielding station_id, year, avg_max_temp, avg_min_temp and total_precipitation.
         """
         try:
-            # Create a session
-            session = self.Session()
-
-            # Query to calculate the statistics
-            yearly_stats = session.query(
+            # AVG and SUM already ignore NULL values
+            yearly_stats = select(
                 WeatherData.station_id,
-                func.extract('year', WeatherData.date).label('year'),
-                func.avg(case([(WeatherData.max_temp != None, WeatherData.max_temp)], else_=None)).label('avg_max_temp'),
-                func.avg(case([(WeatherData.min_temp != None, WeatherData.min_temp)], else_=None)).label('avg_min_temp'),
-                func.sum(case([(WeatherData.precipitation != None, WeatherData.precipitation)], else_=0.0)).label('total_precipitation')
+                WEATHER_DATA_YEAR.label('year'),
+                func.avg(WeatherData.max_temp).label('avg_max_temp'),
+                func.avg(WeatherData.min_temp).label('avg_min_temp'),
+                func.coalesce(func.sum(WeatherData.precipitation), 0.0).label('total_precipitation')
             ).group_by(
                 WeatherData.station_id,
-                func.extract('year', WeatherData.date)
-            ).all()
+                WEATHER_DATA_YEAR
+            )
 
             return yearly_stats
 
         except Exception as e:
             logging.error(f"Error in calculating yearly statistics: {e}")
             raise CustomException(e, sys)
-        finally:
-            session.close()
 
     def store_yearly_stats(self, yearly_stats):
         """
         Store calculated yearly statistics into the 'weather_station_yearly_stats' table.
 
+        The aggregation runs inside a single INSERT ... SELECT statement, so the statistics never
+        leave the database. Rows that already exist for a (station_id, year) pair are skipped
+        through the 'unique_station_year' constraint.
+
         Args:
-            yearly_stats (list): List of tuples containing yearly statistics for each station.
+            yearly_stats (Select): Query returned by calculate_yearly_stats.
 
         Raises:
             CustomException: If there is an error in storing the statistics.
         """
         try:
-            # Create a session
-            session = self.Session()
+            stats_table = WeatherStationYearlyStats.__table__
+            dialect_name = self.engine.dialect.name
+            if dialect_name == 'postgresql':
+                stmt = pg_insert(stats_table).from_select(STATS_COLUMNS, yearly_stats).on_conflict_do_nothing(
+                    index_elements=['station_id', 'year']
+                )
+            elif dialect_name == 'sqlite':
+                stmt = stats_table.insert().from_select(STATS_COLUMNS, yearly_stats).prefix_with('OR IGNORE')
+            else:
+                self._store_new_yearly_stats(self._stream_yearly_stats(yearly_stats))
+                return
+
+            with self.engine.begin() as connection:
+                result = connection.execute(stmt)
+
+            logging.info(f"{result.rowcount} new yearly statistics records inserted")
+            logging.info("Yearly statistics stored successfully")
+
+        except Exception as e:
+            logging.error(f"Error in storing yearly statistics: {e}")
+            raise CustomException(e, sys)
+
+    def _stream_yearly_stats(self, yearly_stats):
+        """
+        Stream the rows of the yearly statistics query from a server-side cursor.
+
+        Args:
+            yearly_stats (Select): Query returned by calculate_yearly_stats.
+
+        Yields:
+            dict: Yearly statistics keyed by the 'weather_station_yearly_stats' column names.
+        """
+        with self.engine.connect() as connection:
+            result = connection.execution_options(stream_results=True).execute(yearly_stats)
+            for row in result.mappings().yield_per(STREAM_BATCH_SIZE):
+                yield dict(row)
+
+    def _store_new_yearly_stats(self, rows):
+        """
+        Store yearly statistics in buffered batches, skipping rows that already exist.
+
+        Used for database dialects without an INSERT ... ON CONFLICT DO NOTHING equivalent.
+
+        Args:
+            rows (iterable): Dictionaries keyed by the 'weather_station_yearly_stats' column names.
+        """
+        session = self.Session()
+        try:
             skipped_records = 0
-            for stat in yearly_stats:
-                # Check if the record already exists
-                existing_record = session.query(WeatherStationYearlyStats).filter_by(
-                    station_id=stat.station_id,
-                    year=int(stat.year)
-                ).first()
+            new_records = []
+
+            # Load the stored (station_id, year) pairs in one query instead of checking each row
+            existing_records = set(session.execute(
+                select(WeatherStationYearlyStats.station_id, WeatherStationYearlyStats.year)
+            ).all())
 
-                if existing_record:
+            for row in rows:
+                # Check if the record already exists
+                if (row['station_id'], int(row['year'])) in existing_records:
                     skipped_records += 1
-                    #logging.info(f"Record for station_id {stat.station_id} and year {stat.year} already exists. Skipping.")
-                else:
-                    new_record = WeatherStationYearlyStats(
-                        station_id=stat.station_id,
-                        year=int(stat.year),
-                        avg_max_temp=stat.avg_max_temp if stat.avg_max_temp is not None else None,
-                        avg_min_temp=stat.avg_min_temp if stat.avg_min_temp is not None else None,
-                        total_precipitation=stat.total_precipitation if stat.total_precipitation is not None else None
-                    )
-                    session.add(new_record)
+                    continue
+
+                new_records.append(row)
+                if len(new_records) >= STORE_BATCH_SIZE:
+                    session.bulk_insert_mappings(WeatherStationYearlyStats, new_records)
+                    new_records = []
+
+            if new_records:
+                session.bulk_insert_mappings(WeatherStationYearlyStats, new_records)
 
             # Commit the transaction
             logging.info(f"{skipped_records} records already exist. Skipping.")
             session.commit()
             logging.info("Yearly statistics stored successfully")
-
-        except Exception as e:
-            logging.error(f"Error in storing yearly statistics: {e}")
-            raise CustomException(e, sys)
         finally:
             session.close()
@@ -2,18 +2,136 @@ from typing import Set
 import os
 import sys
 import csv
+import io
 import time
-from datetime import datetime
 import concurrent.futures
-from sqlalchemy import create_engine, exc
-from sqlalchemy.orm import sessionmaker
+import numpy as np
+import pandas as pd
+from sqlalchemy import exc, MetaData, Table, Column, String, Date, Integer
+from sqlalchemy.schema import CreateIndex, DropIndex
 from src.logger import logging  # Assuming logging setup in 'src/logger.py'
 from src.exception import CustomException
 from src.components.data_modelling import WeatherData, Base
-from src.config.database_config import SQLALCHEMY_DATABASE_URI
+from src.config.database_config import SQLALCHEMY_DATABASE_URI, get_engine
 
-# Create the SQLAlchemy engine
-engine = create_engine(SQLALCHEMY_DATABASE_URI)
+# Shared, pooled SQLAlchemy engine; executemany() calls are folded into multi-row INSERT ... VALUES pages
+engine = get_engine(SQLALCHEMY_DATABASE_URI)
+
+# Column layout of the tab-separated weather data files
+WEATHER_FILE_COLUMNS = ['date', 'max_temp', 'min_temp', 'precipitation']
+# Extra column catching a fifth field, so a line ending in a tab still parses
+TRAILING_FIELD = 'trailing'
+MISSING_VALUE = -9999
+
+# Range of the int32 values are staged as
+INT32_INFO = np.iinfo(np.int32)
+
+# Bulk load statement for the staging table; empty CSV fields are loaded as NULL
+COPY_TEMP_WEATHER_DATA = """
+    COPY temp_weather_data (station_id, date, max_temp, min_temp, precipitation)
+    FROM STDIN WITH (FORMAT csv, NULL '')
+"""
+
+# Core table definition for the 'temp_weather_data' staging table; values are staged as raw
+# integer tenths and scaled once in SQL when moved into 'weather_data'. The table is dropped
+# after every run, so it is UNLOGGED to keep the staged rows out of the WAL
+temp_weather_data = Table(
+    'temp_weather_data', MetaData(),
+    Column('station_id', String),
+    Column('date', Date),
+    Column('max_temp', Integer),
+    Column('min_temp', Integer),
+    Column('precipitation', Integer),
+    prefixes=['UNLOGGED']
+)
+
+def build_dates(values):
+    """
+    Convert YYYYMMDD integers into dates with vectorized integer arithmetic.
+
+    Splitting the digits numerically avoids creating a string per row and running a
+    date format parser over it.
+
+    Args:
+        values (np.ndarray): Integer dates in YYYYMMDD form.
+
+    Returns:
+        np.ndarray: Dates as a datetime64[D] array.
+        np.ndarray: Boolean mask, True where a value is not a valid calendar date.
+    """
+    year, month, day = values // 10000, values // 100 % 100, values % 100
+    months = ((year - 1970) * 12 + month - 1).astype('datetime64[M]')
+    dates = months.astype('datetime64[D]') + (day - 1)
+
+    # Days past the end of the month roll over into the next one, so compare the months back
+    invalid = (month < 1) | (month > 12) | (day < 1) | (dates.astype('datetime64[M]') != months)
+    return dates, invalid
+
+def read_weather_file(content, dtype):
+    """
+    Read the contents of a weather data file, dropping lines with too many fields.
+
+    Args:
+        content (bytes): Raw contents of the file.
+        dtype: Type every field is read as.
+
+    Returns:
+        pd.DataFrame: Records with 'date', 'max_temp', 'min_temp' and 'precipitation' columns.
+    """
+    try:
+        # index_col=False stops a wide first line from being taken as an index column, which
+        # would shift the fields of every line in the file
+        df = pd.read_csv(io.BytesIO(content), sep='\t', header=None,
+                         names=WEATHER_FILE_COLUMNS + [TRAILING_FIELD],
+                         dtype={**dict.fromkeys(WEATHER_FILE_COLUMNS, dtype), TRAILING_FIELD: str},
+                         na_filter=False, index_col=False, on_bad_lines='skip')
+    except pd.errors.EmptyDataError:
+        # Raised when the file has no lines at all
+        return pd.DataFrame({column: pd.Series(dtype=dtype) for column in WEATHER_FILE_COLUMNS})
+
+    # An empty fifth field is just a trailing tab; any other value makes the line malformed
+    return df[df.pop(TRAILING_FIELD) == '']
+
+def parse_file(file_path):
+    """
+    Parse a weather data file into a DataFrame ready for staging.
+
+    Malformed lines (wrong number of fields, non-integer or out-of-range values, or invalid
+    dates) are dropped and counted rather than failing the whole file.
+
+    Defined at module level so it can be shipped to worker processes.
+
+    Args:
+        file_path (str): Path to the file to be parsed.
+
+    Returns:
+        pd.DataFrame: Records with 'date', 'max_temp', 'min_temp' and 'precipitation' columns,
+        values kept as integer tenths with -9999 marking a missing value.
+        int: Number of malformed lines dropped.
+    """
+    with open(file_path, 'rb') as file:
+        content = file.read()
+
+    try:
+        # Parse the whole file in one vectorized pass; every field is an integer
+        df = read_weather_file(content, 'int64')
+    except (ValueError, OverflowError):
+        # Only files with a missing, non-integer or oversized field take the slower text path
+        df = read_weather_file(content, str).apply(pd.to_numeric, errors='coerce')
+        df = df[(df.notna() & (df % 1 == 0)).all(axis=1)]
+
+    # Values are narrowed to int32, so anything outside its range would wrap around
+    df = df[((df >= INT32_INFO.min) & (df <= INT32_INFO.max)).all(axis=1)].astype('int32')
+
+    dates, invalid = build_dates(df['date'].to_numpy())
+    df = df[~invalid].reset_index(drop=True)
+
+    # Kept as datetime64; COPY receives the same ISO dates as it would from date objects
+    df['date'] = dates[~invalid]
+
+    # Every non-empty line holds one record, so whatever was dropped along the way was malformed
+    malformed_lines = sum(1 for line in content.splitlines() if line) - len(df)
+    return df, malformed_lines
 
 class DataIngestionConfig:
     """
@@ -21,18 +139,18 @@ class DataIngestionConfig:
 
     Attributes:
         folder_path (str): Path to the folder containing data files.
-        batch_size (int): Number of records to process in each batch.
+        max_workers (int): Number of worker processes parsing files.
     """
-    def __init__(self, folder_path="wx_data", batch_size=5000):
+    def __init__(self, folder_path="wx_data", max_workers=None):
         """
         Initialize DataIngestionConfig instance.
 
         Args:
             folder_path (str, optional): Path to the folder containing data files. Default is "wx_data".
-            batch_size (int, optional): Number of records to process in each batch. Default is 5000.
+            max_workers (int, optional): Number of worker processes parsing files. Default is the CPU count.
         """
         self.folder_path = folder_path
-        self.batch_size = batch_size
+        self.max_workers = max_workers or os.cpu_count()
 
 class DataIngestion:
     """
@@ -40,7 +158,6 @@ class DataIngestion:
 
     Attributes:
         ingestion_config (DataIngestionConfig): Configuration object containing data ingestion settings.
-        existing_records (Set[(str, datetime.date)]): Set to store existing (station_id, date) tuples.
     """
     def __init__(self, ingestion_config: DataIngestionConfig):
         """
@@ -50,124 +167,141 @@ class DataIngestion:
             ingestion_config (DataIngestionConfig): Configuration object containing data ingestion settings.
         """
         self.ingestion_config = ingestion_config
-        self.existing_records = set()  # To store existing (station_id, date) tuples
-        self._fetch_existing_records()
-
-    def _fetch_existing_records(self):
-        """
-        Fetch existing (station_id, date) tuples from the database and store them in self.existing_records.
-        """
-        try:
-            # Establish session to query existing records
-            Session = sessionmaker(bind=engine)
-            session = Session()
-            existing_records = session.query(WeatherData.station_id, WeatherData.date).all()
-            self.existing_records = {(record.station_id, record.date) for record in existing_records}
-            
-            session.close()
-        except Exception as e:
-            logging.error(f"Error fetching existing records from database: {e}")
 
     def create_temporary_table(self):
         """
         Create temporary table 'temp_weather_data' in the database for staging data ingestion.
         """
         try:
-            with engine.connect() as connection:
-                connection.execute("""
-                    CREATE TABLE temp_weather_data (
-                        station_id VARCHAR,
-                        date DATE,
-                        max_temp FLOAT,
-                        min_temp FLOAT,
-                        precipitation FLOAT
-                    )
-                """)
-                logging.info("Temporary table 'temp_weather_data' created successfully")
+            with engine.begin() as connection:
+                temp_weather_data.create(connection)
+                # The table only lives for one ingestion run, so autovacuum has nothing to gain
+                connection.execute("ALTER TABLE temp_weather_data SET (autovacuum_enabled = false)")
+            logging.info("Temporary table 'temp_weather_data' created successfully")
         except Exception as e:
             logging.error(f"Error creating temporary table: {e}")
 
-    def process_file(self, file_path):
+    def copy_records(self, connection, df):
+        """
+        Stream records into the temporary table 'temp_weather_data' with PostgreSQL COPY FROM STDIN.
+
+        Args:
+            connection: DBAPI (psycopg2) connection to copy through.
+            df (pd.DataFrame): Records in 'temp_weather_data' column order.
+        """
+        buffer = io.StringIO()
+        df.to_csv(buffer, index=False, header=False)
+        buffer.seek(0)
+
+        with connection.cursor() as cursor:
+            cursor.copy_expert(COPY_TEMP_WEATHER_DATA, buffer)
+
+    def process_file(self, file_path, df, connection, malformed_lines=0):
         """
-        Process each file in the specified folder path:
-        - Parse data from each line.
-        - Validate and convert data types.
-        - Check for duplicates and insert valid records into the temporary table.
+        Process a parsed file:
+        - Tag the records with the file's station_id.
+        - Copy them into the temporary table and commit them.
+
+        Records that already exist in the database are skipped later, when they are moved into
+        'weather_data'.
 
         Args:
-            file_path (str): Path to the file to be processed.
+            file_path (str): Path to the file the records were parsed from.
+            df (pd.DataFrame): Records returned by parse_file.
+            connection: DBAPI (psycopg2) connection used for the COPY.
+            malformed_lines (int, optional): Number of malformed lines parse_file dropped. Default is 0.
 
         Returns:
             int: Number of processed records.
-            int: Number of duplicate records skipped.
         """
         processed_count = 0
-        duplicate_count = 0
-        
+
         try:
-            with open(file_path, 'r') as file:
-                for line in file:
-                    data = line.strip().split('\t')
-                    if len(data) == 4:
-                        date_str, max_temp_str, min_temp_str, precipitation_str = data
-                        try:
-                            date = datetime.strptime(date_str, '%Y%m%d').date()
-                            max_temp = float(max_temp_str) / 10.0
-                            min_temp = float(min_temp_str) / 10.0
-                            precipitation = float(precipitation_str) / 10.0
-                            station_id = os.path.basename(file_path).split('.')[0]
-
-                            # Check if (station_id, date) already exists in database
-                            if (station_id, date) in self.existing_records:
-                                logging.debug(f"Skipping duplicate record: {station_id}, {date}")
-                                duplicate_count += 1
-                                continue
-
-                            # Insert into temporary table
-                            with engine.connect() as connection:
-                                connection.execute("""
-                                    INSERT INTO temp_weather_data (station_id, date, max_temp, min_temp, precipitation)
-                                    VALUES (%s, %s, %s, %s, %s)
-                                """, (station_id, date, max_temp if max_temp != -9999 else None,
-                                      min_temp if min_temp != -9999 else None,
-                                      precipitation if precipitation != -9999 else None))
-                            
-                            processed_count += 1
-                        except Exception as e:
-                            logging.error(f"Error processing line: {line}. Error: {e}")
-                            exit(1)
-        
-            logging.info(f"Finished processing file: {file_path}. Processed: {processed_count}, Duplicates: {duplicate_count}")
+            # The station is the same for every record of a file
+            station_id = os.path.splitext(os.path.basename(file_path))[0]
+            df.insert(0, 'station_id', station_id)
+
+            # Copy into temporary table, committing once per file
+            self.copy_records(connection, df)
+            connection.commit()
+            processed_count = len(df)
+
+            # Report malformed lines once per file instead of failing the file or the run
+            if malformed_lines:
+                logging.warning("File %s had %d malformed lines", file_path, malformed_lines)
+
+            logging.info("Finished processing file: %s. Processed: %d", file_path, processed_count)
             
-            return processed_count, duplicate_count
+            return processed_count
         except Exception as e:
-            logging.error(f"Error in processing file: {file_path}. Error: {e}")
-            return processed_count, duplicate_count
+            connection.rollback()
+            logging.error("Error in processing file: %s. Error: %s", file_path, e)
+            return processed_count
 
     def insert_into_main_table(self):
         """
         Insert data from the temporary table 'temp_weather_data' into the main table 'weather_data'.
+
+        Duplicates are resolved by the database: records whose (station_id, date) already exists
+        are removed by an anti-join, and ON CONFLICT DO NOTHING skips any repeated within the
+        staged data itself. When 'weather_data' is empty its secondary indexes are dropped for
+        the load and rebuilt once afterwards.
+
+        Returns:
+            int: Number of records inserted into 'weather_data'.
+
+        Raises:
+            CustomException: If the records could not be inserted; the load is rolled back.
         """
         try:
-            with engine.connect() as connection:
-                connection.execute("""
+            with engine.begin() as connection:
+                # Give the planner statistics for the freshly loaded staging table
+                connection.execute("ANALYZE temp_weather_data")
+
+                # Building the indexes once over a full table beats maintaining them row by row
+                rebuild_indexes = connection.execute("SELECT NOT EXISTS (SELECT 1 FROM weather_data)").scalar()
+                secondary_indexes = sorted(WeatherData.__table__.indexes, key=lambda index: index.name)
+                if rebuild_indexes:
+                    logging.info("'weather_data' is empty, dropping its secondary indexes for the load")
+                    # Databases created before an index was added to the model do not have it yet
+                    for index in secondary_indexes:
+                        connection.execute(DropIndex(index, if_exists=True))
+
+                # Map the missing-value sentinel to NULL and scale the tenths in one set-based pass
+                result = connection.execute(f"""
                     INSERT INTO weather_data (station_id, date, max_temp, min_temp, precipitation)
-                    SELECT station_id, date, max_temp, min_temp, precipitation
-                    FROM temp_weather_data
+                    SELECT t.station_id, t.date,
+                           NULLIF(t.max_temp, {MISSING_VALUE}) / 10.0,
+                           NULLIF(t.min_temp, {MISSING_VALUE}) / 10.0,
+                           NULLIF(t.precipitation, {MISSING_VALUE}) / 10.0
+                    FROM temp_weather_data t
+                    WHERE NOT EXISTS (
+                        SELECT 1 FROM weather_data d
+                        WHERE d.station_id = t.station_id AND d.date = t.date
+                    )
                     ON CONFLICT (station_id, date) DO NOTHING
                 """)
+
+                if rebuild_indexes:
+                    logging.info("Rebuilding the secondary indexes of 'weather_data'")
+                    for index in secondary_indexes:
+                        connection.execute(CreateIndex(index, if_not_exists=True))
+
                 logging.info("Data successfully inserted into 'weather_data' table from temporary table")
+                return result.rowcount
         except exc.ProgrammingError as e:
             logging.error(f"Error inserting data into 'weather_data' table: {e}")
+            raise CustomException(e, sys)
         except Exception as e:
             logging.error(f"Unexpected error inserting data into 'weather_data' table: {e}")
+            raise CustomException(e, sys)
 
     def initiate_data_ingestion(self):
         """
         Initiates the data ingestion process:
         - Creates a temporary table.
-        - Processes each file in the specified folder concurrently.
-        - Inserts valid data into the temporary table.
+        - Parses each file in the specified folder concurrently in worker processes.
+        - Copies valid data into the temporary table from the parent process.
         - Inserts data from the temporary table into the main table.
         - Logs ingestion progress and completion.
         """
@@ -177,33 +311,43 @@ class DataIngestion:
         try:
             self.create_temporary_table() 
             folder_path = self.ingestion_config.folder_path
-            logging.info(f"Reading files from folder: {folder_path}")
+            logging.info("Reading files from folder: %s", folder_path)
 
-            files = [os.path.join(folder_path, f) for f in os.listdir(folder_path) if f.endswith('.txt')]
+            # Submit the largest files first so the workers all finish close together instead of
+            # one of them picking up a large file at the end of the run
+            with os.scandir(folder_path) as entries:
+                sized_files = [(entry.stat().st_size, entry.path) for entry in entries
+                               if entry.name.endswith('.txt') and entry.is_file()]
+            files = [file_path for _, file_path in sorted(sized_files, reverse=True)]
             
-            total_duplicates = 0
             total_processed = 0
             
-            with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
-                futures = [executor.submit(self.process_file, file_path) for file_path in files]
-                for future in concurrent.futures.as_completed(futures):
-                    try:
-                        processed_count, duplicate_count = future.result()
-                        total_duplicates += duplicate_count
-                        total_processed += processed_count
-                    except Exception as e:
-                        logging.error(f"Error in future result: {e}")
+            # Parsing is CPU bound and runs in worker processes; database writes stay serial
+            # on a single DBAPI connection that COPYs each file into the temporary table
+            connection = engine.raw_connection()
+            try:
+                with concurrent.futures.ProcessPoolExecutor(max_workers=self.ingestion_config.max_workers) as executor:
+                    futures = {executor.submit(parse_file, file_path): file_path for file_path in files}
+                    for future in concurrent.futures.as_completed(futures):
+                        try:
+                            df, malformed_lines = future.result()
+                            total_processed += self.process_file(futures[future], df, connection, malformed_lines)
+                        except Exception as e:
+                            logging.error("Error in future result: %s", e)
+            finally:
+                connection.close()
             
-            self.insert_into_main_table()
+            total_inserted = self.insert_into_main_table()
 
             end_time = time.time()
-            logging.info(f"Data ingestion Started at {start_time} and Ended at {end_time}")
-            logging.info(f"Data ingestion completed in {end_time - start_time:.2f} seconds")
-            logging.info(f"Total records processed: {total_processed}")
-            logging.info(f"Total duplicate records skipped: {total_duplicates}")
+            logging.info("Data ingestion Started at %s and Ended at %s", start_time, end_time)
+            logging.info("Data ingestion completed in %.2f seconds", end_time - start_time)
+            logging.info("Total records processed: %d", total_processed)
+            logging.info("Total records inserted: %d", total_inserted)
+            logging.info("Total duplicate records skipped: %d", total_processed - total_inserted)
 
         except Exception as e:
-            logging.error(f"Error in data ingestion process: {e}")
+            logging.error("Error in data ingestion process: %s", e)
             raise CustomException(e, sys)
         finally:
             logging.info("Dropping temporary table 'temp_weather_data'")
@@ -212,5 +356,5 @@ class DataIngestion:
                     connection.execute("DROP TABLE IF EXISTS temp_weather_data")
                 logging.info("Temporary table 'temp_weather_data' dropped successfully")
             except Exception as e:
-                logging.error(f"Error dropping temporary table 'temp_weather_data': {e}")
+                logging.error("Error dropping temporary table 'temp_weather_data': %s", e)
 
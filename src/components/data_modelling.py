@@ -1,9 +1,9 @@
 from dataclasses import dataclass
-from sqlalchemy import Column, Integer, String, Float, Date, create_engine, UniqueConstraint
+from sqlalchemy import Column, Integer, String, Float, Date, UniqueConstraint, Index, func, cast, inspect
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy import MetaData
 from datetime import date
+from src.config.database_config import get_engine
 from src.logger import logging
 from src.exception import CustomException
 import sys
@@ -52,6 +52,13 @@ class WeatherData(Base):
             'precipitation': self.precipitation
         }
 
+# Year of a weather data record, as grouped on when calculating yearly statistics
+WEATHER_DATA_YEAR = cast(func.extract('year', WeatherData.date), Integer)
+
+# 'unique_station_date' already provides the composite (station_id, date) B-tree index;
+# this expression index matches the (station_id, year) grouping of the yearly statistics
+Index('ix_weather_data_station_year', WeatherData.station_id, WEATHER_DATA_YEAR)
+
 @dataclass
 class DataModellingConfig:
     """
@@ -77,7 +84,6 @@ class DataModelling:
         engine (sqlalchemy.engine.Engine): SQLAlchemy engine for database operations.
         Base (sqlalchemy.ext.declarative.declarative_base): Base class for SQLAlchemy models.
         Session (sqlalchemy.orm.session.sessionmaker): Session maker for database transactions.
-        metadata (sqlalchemy.MetaData): Metadata for database schema reflection.
     """
     def __init__(self, config):
         """
@@ -87,18 +93,15 @@ class DataModelling:
             config (DataModellingConfig): Configuration object containing database URI.
         """
         try:
-            # Connect to the database using the provided URI
-            self.engine = create_engine(config.database_uri)
+            # Connect to the database through the shared engine for the provided URI
+            self.engine = get_engine(config.database_uri)
             
             # Assign SQLAlchemy base class and session maker
             self.Base = Base
             self.Session = sessionmaker(bind=self.engine)
             
-            # Reflect existing tables and check if 'weather_data' table exists
-            self.metadata = MetaData(bind=self.engine)
-            self.metadata.reflect()
-            
-            if 'weather_data' not in self.metadata.tables:
+            # Check if 'weather_data' table exists without reflecting the whole schema
+            if not inspect(self.engine).has_table('weather_data'):
                 # Create 'weather_data' table if it does not exist
                 logging.info("Creating 'weather_data' table...")
                 self.Base.metadata.create_all(self.engine)
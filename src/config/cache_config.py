@@ -0,0 +1,28 @@
+import os
+
+# Flask-Caching settings for the API responses
+CACHE_CONFIG = {
+    'CACHE_TYPE': os.environ.get('CACHE_TYPE', 'SimpleCache'),
+    'CACHE_REDIS_URL': os.environ.get('CACHE_REDIS_URL', 'redis://localhost:6379/0'),
+    'CACHE_DEFAULT_TIMEOUT': 3600
+}
+
+# Backends whose entries are shared between processes, so the pipeline can clear them for the API
+SHARED_CACHE_TYPES = ('RedisCache', 'RedisSentinelCache', 'RedisClusterCache', 'MemcachedCache',
+                      'SASLMemcachedCache', 'FileSystemCache')
+
+
+# CACHE_TYPE:
+# - 'SimpleCache' keeps entries in the memory of each worker process.
+# - Set to 'RedisCache' (requires the 'redis' package) to share entries between workers
+#   and let the pipeline clear them once new statistics are stored.
+
+# CACHE_REDIS_URL:
+# - Location of the Redis server used when CACHE_TYPE is 'RedisCache'.
+
+# CACHE_DEFAULT_TIMEOUT:
+# - Seconds a cached response is served before it is computed again.
+
+# SHARED_CACHE_TYPES:
+# - main.py only clears the cache after storing statistics when CACHE_TYPE is one of these; with a
+#   per-process backend it logs a warning and the entries expire after CACHE_DEFAULT_TIMEOUT.
@@ -1,5 +1,8 @@
+import os
+from functools import lru_cache
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 
 # Define the components of the PostgreSQL URI
 db_username = 'postgres'
@@ -14,8 +17,51 @@ SQLALCHEMY_DATABASE_URI = f'postgresql://{db_username}:{db_password}@{db_host}:{
 # Create a base class for declarative class definitions
 Base = declarative_base()
 
+# Rows per multi-row INSERT ... VALUES statement and statements per batch for psycopg2 executemany()
+EXECUTEMANY_VALUES_PAGE_SIZE = 10000
+EXECUTEMANY_BATCH_PAGE_SIZE = 500
+
+# Connections each process may hold: DB_POOL_SIZE kept open plus DB_MAX_OVERFLOW opened under load
+DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 5))
+DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 5))
+
+@lru_cache(maxsize=None)
+def get_engine(database_uri):
+    """
+    Return the pooled engine for a database URI, creating it on first use.
+
+    Args:
+        database_uri (str): URI for the database connection.
+
+    Returns:
+        sqlalchemy.engine.Engine: Engine shared by every caller using the same URI.
+    """
+    url = make_url(database_uri)
+
+    # SQLite uses its own single-connection pools that take no sizing arguments
+    if url.get_backend_name() == 'sqlite':
+        return create_engine(database_uri)
+
+    # Fold executemany() calls into multi-row INSERT ... VALUES pages and batched statements
+    executemany_options = {}
+    if url.get_driver_name() == 'psycopg2':
+        executemany_options = dict(
+            executemany_mode='values_plus_batch',
+            executemany_values_page_size=EXECUTEMANY_VALUES_PAGE_SIZE,
+            executemany_batch_page_size=EXECUTEMANY_BATCH_PAGE_SIZE
+        )
+
+    return create_engine(
+        database_uri,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_pre_ping=True,
+        pool_recycle=3600,
+        **executemany_options
+    )
+
 # Create an SQLAlchemy engine
-engine = create_engine(SQLALCHEMY_DATABASE_URI)
+engine = get_engine(SQLALCHEMY_DATABASE_URI)
 
 
 # db_username, db_password, db_host, db_port, db_name:
@@ -30,6 +76,18 @@ engine = create_engine(SQLALCHEMY_DATABASE_URI)
 # - Base class for declarative class definitions using SQLAlchemy.
 # - All models should inherit from this base class.
 
+# get_engine:
+# - Returns one engine per database URI, so components share a connection pool instead of
+#   opening their own connections on every instantiation.
+# - Connections are checked with a ping before use and recycled after an hour.
+
+# DB_POOL_SIZE, DB_MAX_OVERFLOW:
+# - Every process (each Gunicorn worker, the pipeline) owns a separate pool, so the server may see up to
+#   processes x (DB_POOL_SIZE + DB_MAX_OVERFLOW) connections. Keep that product below PostgreSQL's
+#   max_connections (100 by default); gunicorn.conf.py divides DB_MAX_CONNECTIONS between its workers.
+# - psycopg2 engines run executemany() through the fast execution helpers, so bulk DML is sent
+#   as multi-row INSERT ... VALUES pages rather than one statement per row.
+
 # engine:
 # - SQLAlchemy engine object that manages database connections and executes SQL commands.
 
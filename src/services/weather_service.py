@@ -1,7 +1,7 @@
 from decimal import Decimal
 import sys
 from flask import jsonify, request
-from sqlalchemy import func
+from sqlalchemy import func, select, text, tuple_
 from src.components.data_analysis import WeatherStationYearlyStats
 from src.config.database_config import engine
 from src.components.data_modelling import WeatherData
@@ -9,92 +9,165 @@ from sqlalchemy.orm import sessionmaker
 from src.exception import CustomException
 from src.logger import logging
 
-# Create a session to interact with the database
+# Session factory; each call opens its own session so concurrent requests never share one
 Session = sessionmaker(bind=engine)
-session = Session()
 
-def get_weather_data(station_id, date, page, per_page):
+# Columns returned for each record, in the same shape as the models' to_dict(); selecting them
+# with Core yields plain rows instead of tracked ORM instances
+weather_data_columns = WeatherData.__table__.c
+stats_columns = WeatherStationYearlyStats.__table__.c
+WEATHER_DATA_FIELDS = ['station_id', 'date', 'max_temp', 'min_temp', 'precipitation']
+STATS_FIELDS = ['station_id', 'year', 'avg_max_temp', 'avg_min_temp', 'total_precipitation']
+
+# Planner estimate of a table's row count, kept up to date by ANALYZE and autovacuum; to_regclass
+# resolves the name through the search_path, like the queries themselves do
+ESTIMATED_COUNT_QUERY = text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table_name)")
+
+def count_records(session, query, table_name, filtered):
+    """
+    Count the records matched by a query, estimating the count for unfiltered PostgreSQL tables.
+
+    An exact COUNT over a whole table scans every row, while the planner statistics in
+    pg_class answer instantly; filtered queries are narrowed by an index and counted exactly.
+
+    Args:
+        session (Session): Session to run the count in.
+        query (Select): Query whose matching records are counted.
+        table_name (str): Name of the table the query selects from.
+        filtered (bool): Whether the query filters the table.
+
+    Returns:
+        int: Exact or estimated number of matching records.
+    """
+    if not filtered and session.bind.dialect.name == 'postgresql':
+        estimate = session.execute(ESTIMATED_COUNT_QUERY, {'table_name': table_name}).scalar()
+        # Tables that were never analyzed report -1, or 0 before PostgreSQL 14, so count those exactly
+        if estimate is not None and estimate > 0:
+            return estimate
+
+    return session.execute(select(func.count()).select_from(query.order_by(None).subquery())).scalar()
+
+def get_weather_data(station_id, date, after_station_id, after_date, per_page, include_total=False):
     """
     Retrieve weather data records based on optional filters.
 
+    Records are paginated by keyset on (station_id, date): each page resumes after the last
+    record of the previous one, which the database locates through the 'unique_station_date'
+    index instead of scanning and discarding the skipped rows.
+
     Args:
         station_id (str): ID of the weather station.
         date (str): Date in YYYY-MM-DD format to filter records by date.
-        page (int): Page number of results for pagination.
+        after_station_id (str): Station of the last record of the previous page, from 'next_cursor'.
+        after_date (str): Date of the last record of the previous page, from 'next_cursor'.
         per_page (int): Number of records per page for pagination.
+        include_total (bool, optional): Whether to include the number of matching records. Default is False.
 
     Returns:
         dict: Dictionary containing paginated weather data records and metadata.
-              Keys: 'total', 'page', 'per_page', 'data'.
+              Keys: 'per_page', 'next_cursor', 'data', and 'total' when include_total is set.
     Raises:
         CustomException: If there is an error while querying the database.
     """
     try:
-        query = session.query(WeatherData)
-
-        # Apply filters if provided
-        if station_id:
-            query = query.filter(WeatherData.station_id == station_id)
-        if date:
-            query = query.filter(WeatherData.date == date)
-
-        # Count total matching records
-        total = query.count()
-
-        # Paginate and retrieve data
-        data = query.offset((page - 1) * per_page).limit(per_page).all()
-
-        # Prepare result dictionary
-        result = {
-            'total': total,
-            'page': page,
-            'per_page': per_page,
-            'data': [record.to_dict() for record in data]  # Convert each record to dictionary format
-        }
-        return result
+        with Session() as session:
+            query = select(*(weather_data_columns[field] for field in WEATHER_DATA_FIELDS))
+
+            # Apply filters if provided
+            if station_id:
+                query = query.where(weather_data_columns.station_id == station_id)
+            if date:
+                query = query.where(weather_data_columns.date == date)
+
+            # Count only on request; the count covers every page, so it is taken before the cursor
+            total = None
+            if include_total:
+                total = count_records(session, query, WeatherData.__tablename__, bool(station_id or date))
+
+            # Resume after the last record of the previous page
+            if after_station_id and after_date:
+                query = query.where(tuple_(weather_data_columns.station_id, weather_data_columns.date) > (after_station_id, after_date))
+
+            # Paginate and retrieve data
+            query = query.order_by(weather_data_columns.station_id, weather_data_columns.date).limit(per_page)
+            data = session.execute(query).mappings().all()
+
+            # A full page means there may be more records after it
+            next_cursor = None
+            if data and len(data) == per_page:
+                next_cursor = {'after_station_id': data[-1]['station_id'], 'after_date': data[-1]['date'].isoformat()}
+
+            # Prepare result dictionary
+            result = {
+                'per_page': per_page,
+                'next_cursor': next_cursor,
+                'data': [{**record, 'date': record['date'].isoformat()} for record in data]
+            }
+            if include_total:
+                result['total'] = total
+            return result
     except Exception as e:
         # Raise a custom exception with detailed error information
         raise CustomException(e, sys)
 
-def get_weather_stats(station_id, page, per_page):
+def get_weather_stats(station_id, after_station_id, after_year, per_page, include_total=False):
     """
     Retrieve yearly weather statistics based on optional filters.
 
+    Statistics are paginated by keyset on (station_id, year), which the 'unique_station_year'
+    index serves directly, so deep pages cost the same as the first one.
+
     Args:
         station_id (str): ID of the weather station.
-        page (int): Page number of results for pagination.
+        after_station_id (str): Station of the last record of the previous page, from 'next_cursor'.
+        after_year (int): Year of the last record of the previous page, from 'next_cursor'.
         per_page (int): Number of records per page for pagination.
+        include_total (bool, optional): Whether to include the number of matching records. Default is False.
 
     Returns:
         dict: Dictionary containing paginated weather statistics and metadata.
-              Keys: 'total', 'page', 'per_page', 'data'.
+              Keys: 'per_page', 'next_cursor', 'data', and 'total' when include_total is set.
     Raises:
         CustomException: If there is an error while querying the database.
     """
     try:
-        query = session.query(WeatherStationYearlyStats)
-
-        # Apply filters if provided
-        if station_id:
-            query = query.filter(WeatherStationYearlyStats.station_id == station_id)
-
-        # Count total matching records
-        total = query.count()
-
-        # Paginate and retrieve statistics data
-        stats_data = query.offset((page - 1) * per_page).limit(per_page).all()
-
-        # Prepare result dictionary
-        result = {
-            'total': total,
-            'page': page,
-            'per_page': per_page,
-            'data': [stats.to_dict() for stats in stats_data]  # Convert each stats record to dictionary format
-        }
-
-        #print(result)  # Temporary print statement for debugging purposes
-
-        return result
+        with Session() as session:
+            query = select(*(stats_columns[field] for field in STATS_FIELDS))
+
+            # Apply filters if provided
+            if station_id:
+                query = query.where(stats_columns.station_id == station_id)
+
+            # Count only on request; the count covers every page, so it is taken before the cursor
+            total = None
+            if include_total:
+                total = count_records(session, query, WeatherStationYearlyStats.__tablename__, bool(station_id))
+
+            # Resume after the last record of the previous page
+            if after_station_id and after_year is not None:
+                query = query.where(tuple_(stats_columns.station_id, stats_columns.year) > (after_station_id, after_year))
+
+            # Paginate and retrieve statistics data
+            query = query.order_by(stats_columns.station_id, stats_columns.year).limit(per_page)
+            stats_data = session.execute(query).mappings().all()
+
+            # A full page means there may be more records after it
+            next_cursor = None
+            if stats_data and len(stats_data) == per_page:
+                next_cursor = {'after_station_id': stats_data[-1]['station_id'], 'after_year': stats_data[-1]['year']}
+
+            # Prepare result dictionary
+            result = {
+                'per_page': per_page,
+                'next_cursor': next_cursor,
+                'data': [dict(stats) for stats in stats_data]  # Rows already carry the to_dict() keys
+            }
+            if include_total:
+                result['total'] = total
+
+            #print(result)  # Temporary print statement for debugging purposes
+
+            return result
     except Exception as e:
         # Raise a custom exception with detailed error information
         raise CustomException(e, sys)
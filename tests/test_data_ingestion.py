@@ -0,0 +1,117 @@
+from src.components.data_ingestion import parse_file
+
+
+def write_weather_file(tmp_path, lines):
+    """
+    Write tab-separated weather data lines to a station file.
+
+    Args:
+        tmp_path (pathlib.Path): Directory to write the file in.
+        lines (list): Lines of the file, without line endings.
+
+    Returns:
+        str: Path to the written file.
+    """
+    file_path = tmp_path / "USC00000001.txt"
+    file_path.write_text("".join(f"{line}\n" for line in lines))
+    return str(file_path)
+
+
+def test_parse_file_keeps_valid_lines(tmp_path):
+    file_path = write_weather_file(tmp_path, ["20000101\t10\t-9999\t3", "20000102\t-5\t-20\t0"])
+
+    df, malformed_lines = parse_file(file_path)
+
+    assert malformed_lines == 0
+    assert list(df['date'].astype(str)) == ["2000-01-01", "2000-01-02"]
+    assert list(df['max_temp']) == [10, -5]
+    assert list(df['min_temp']) == [-9999, -20]
+    assert list(df['precipitation']) == [3, 0]
+
+
+def test_parse_file_drops_lines_with_extra_fields(tmp_path):
+    file_path = write_weather_file(tmp_path, ["20000101\t10\t0\t3", "20000102\t1\t2\t3\t4", "20000103\t1\t2\t3"])
+
+    df, malformed_lines = parse_file(file_path)
+
+    assert malformed_lines == 1
+    assert list(df['date'].astype(str)) == ["2000-01-01", "2000-01-03"]
+
+
+def test_parse_file_drops_a_bad_first_line_only(tmp_path):
+    file_path = write_weather_file(tmp_path, ["20000101\t10\t0\t3\t4", "20000102\t1\t2\t3", "20000103\t4\t5\t6"])
+
+    df, malformed_lines = parse_file(file_path)
+
+    assert malformed_lines == 1
+    assert list(df['date'].astype(str)) == ["2000-01-02", "2000-01-03"]
+    assert list(df['max_temp']) == [1, 4]
+
+
+def test_parse_file_accepts_trailing_tabs(tmp_path):
+    file_path = write_weather_file(tmp_path, ["20000101\t10\t0\t3\t", "20000102\t1\t2\t3", "20000103\t4\t5\t6\t"])
+
+    df, malformed_lines = parse_file(file_path)
+
+    assert malformed_lines == 0
+    assert list(df['date'].astype(str)) == ["2000-01-01", "2000-01-02", "2000-01-03"]
+    assert list(df['precipitation']) == [3, 3, 6]
+
+
+def test_parse_file_ignores_blank_lines(tmp_path):
+    file_path = write_weather_file(tmp_path, ["20000101\t10\t0\t3", "", "20000102\t1\t2\t3", ""])
+
+    df, malformed_lines = parse_file(file_path)
+
+    assert malformed_lines == 0
+    assert len(df) == 2
+
+
+def test_parse_file_drops_short_and_non_integer_lines(tmp_path):
+    file_path = write_weather_file(tmp_path, [
+        "20000101\t10\t0\t3",
+        "20000102\t1",
+        "2000x103\t1\t2\t3",
+        "20000104\t1.5\t2\t3",
+        "20000105\t4\t5\t6",
+    ])
+
+    df, malformed_lines = parse_file(file_path)
+
+    assert malformed_lines == 3
+    assert list(df['date'].astype(str)) == ["2000-01-01", "2000-01-05"]
+    assert df['max_temp'].dtype == 'int32'
+
+
+def test_parse_file_drops_out_of_range_values(tmp_path):
+    file_path = write_weather_file(tmp_path, [
+        "20000101\t10\t0\t3",
+        "20000102\t99999999999\t6\t7",
+        "20000103\t1\t2\t99999999999999999999",
+        "20000104\t4\t5\t6",
+    ])
+
+    df, malformed_lines = parse_file(file_path)
+
+    assert malformed_lines == 2
+    assert list(df['date'].astype(str)) == ["2000-01-01", "2000-01-04"]
+    assert list(df['max_temp']) == [10, 4]
+
+
+def test_parse_file_drops_impossible_dates(tmp_path):
+    file_path = write_weather_file(tmp_path, ["20000230\t1\t2\t3", "20001301\t1\t2\t3", "20000229\t1\t2\t3"])
+
+    df, malformed_lines = parse_file(file_path)
+
+    assert malformed_lines == 2
+    assert list(df['date'].astype(str)) == ["2000-02-29"]
+
+
+def test_parse_file_handles_empty_file(tmp_path):
+    file_path = write_weather_file(tmp_path, [])
+
+    df, malformed_lines = parse_file(file_path)
+
+    assert malformed_lines == 0
+    assert df.empty
+    assert list(df.columns) == ['date', 'max_temp', 'min_temp', 'precipitation']
@@ -0,0 +1,127 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import app
+from src.api.cache import cache
+from src.components.data_analysis import Base as StatsBase, WeatherStationYearlyStats
+from src.components.data_modelling import Base as WeatherBase, WeatherData
+import src.services.weather_service as weather_service
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """
+    Serve the API from a SQLite database seeded with two stations.
+
+    Args:
+        tmp_path (pathlib.Path): Directory to create the database in.
+        monkeypatch (pytest.MonkeyPatch): Used to point the service's sessions at the database.
+
+    Returns:
+        flask.testing.FlaskClient: Test client for the application.
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'weather.db'}")
+    WeatherBase.metadata.create_all(engine)
+    StatsBase.metadata.create_all(engine)
+
+    Session = sessionmaker(bind=engine)
+    monkeypatch.setattr(weather_service, 'Session', Session)
+
+    with Session() as session:
+        session.add_all([
+            WeatherData(station_id=station_id, date=date(2000, 1, day), max_temp=1.0, min_temp=0.0, precipitation=0.5)
+            for station_id in ('USC00000001', 'USC00000002') for day in (1, 2, 3)
+        ])
+        session.add_all([
+            WeatherStationYearlyStats(station_id=station_id, year=year, avg_max_temp=1, avg_min_temp=0, total_precipitation=2)
+            for station_id in ('USC00000001', 'USC00000002') for year in (2000, 2001)
+        ])
+        session.commit()
+
+    # Stats responses are cached per query string; start every test from an empty cache
+    with app.app_context():
+        cache.clear()
+
+    yield app.test_client()
+    engine.dispose()
+
+
+def collect_pages(client, url, cursor_fields, per_page):
+    """
+    Follow 'next_cursor' from the first page until the last one.
+
+    Args:
+        client (flask.testing.FlaskClient): Test client for the application.
+        url (str): Endpoint to page through.
+        cursor_fields (tuple): Fields making up the cursor, used in the key of each record.
+        per_page (int): Number of records per page.
+
+    Returns:
+        list: Cursor keys of every record returned, in order.
+    """
+    keys, params = [], {'per_page': per_page}
+    while True:
+        response = client.get(url, query_string=params)
+        assert response.status_code == 200
+        body = response.get_json()
+        keys += [tuple(record[field] for field in cursor_fields) for record in body['data']]
+        if body['next_cursor'] is None:
+            return keys
+        params = {'per_page': per_page, **body['next_cursor']}
+
+
+def test_weather_cursor_visits_every_record_once(client):
+    keys = collect_pages(client, '/api/weather', ('station_id', 'date'), per_page=4)
+
+    assert keys == [(station_id, f"2000-01-0{day}") for station_id in ('USC00000001', 'USC00000002') for day in (1, 2, 3)]
+
+
+def test_weather_cursor_crosses_stations(client):
+    response = client.get('/api/weather', query_string={'after_station_id': 'USC00000001', 'after_date': '2000-01-03', 'per_page': 1})
+
+    body = response.get_json()
+    assert [(record['station_id'], record['date']) for record in body['data']] == [('USC00000002', '2000-01-01')]
+    assert body['next_cursor'] == {'after_station_id': 'USC00000002', 'after_date': '2000-01-01'}
+
+
+def test_weather_total_only_on_request(client):
+    assert 'total' not in client.get('/api/weather').get_json()
+
+    body = client.get('/api/weather', query_string={'station_id': 'USC00000002', 'include_total': 'true'}).get_json()
+    assert body['total'] == 3
+
+
+@pytest.mark.parametrize('params', [{'after_station_id': 'USC00000001'}, {'after_date': '2000-01-01'}])
+def test_weather_rejects_partial_cursor(client, params):
+    response = client.get('/api/weather', query_string=params)
+
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
+
+
+def test_stats_cursor_visits_every_record_once(client):
+    keys = collect_pages(client, '/api/weather/stats', ('station_id', 'year'), per_page=3)
+
+    assert keys == [(station_id, year) for station_id in ('USC00000001', 'USC00000002') for year in (2000, 2001)]
+
+
+def test_stats_total_only_on_request(client):
+    assert 'total' not in client.get('/api/weather/stats').get_json()
+
+    body = client.get('/api/weather/stats', query_string={'include_total': '1'}).get_json()
+    assert body['total'] == 4
+
+
+@pytest.mark.parametrize('params', [
+    {'after_station_id': 'USC00000001'},
+    {'after_year': '2000'},
+    {'after_station_id': 'USC00000001', 'after_year': 'last'},
+])
+def test_stats_rejects_partial_cursor(client, params):
+    response = client.get('/api/weather/stats', query_string=params)
+
+    assert response.status_code == 400
+    assert 'error' in response.get_json()